@@ -3,5 +3,6 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cook_platform.settings')
 
+# Served with uvicorn workers (see Procfile) so long-lived connections such as
+# the booking events stream (core.views.booking_events) stay on the event loop.
 application = get_asgi_application()
-
@@ -1,23 +1,12 @@
-import os
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
 import environ
-env = environ.Env()
-environ.Env.read_env()
-
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# # CLOUDINARY CONFIG
-# import cloudinary
-# import cloudinary.uploader
-# import cloudinary.api
-# from cloudinary_storage.storage import MediaCloudinaryStorage
-
+# Single pass over .env; variables already set in the environment take precedence.
+env = environ.Env()
+environ.Env.read_env(BASE_DIR / '.env')
 
 SECRET_KEY = env('SECRET_KEY')
 DEBUG = env.bool('DEBUG')
@@ -32,18 +21,19 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    # 'cloudinary',
-    # 'cloudinary_storage',
     'core',
 ]
 
-# CLOUDINARY_STORAGE = {
-#     'CLOUD_NAME': env('CLOUDINARY_CLOUD_NAME'),
-#     'API_KEY': env('CLOUDINARY_API_KEY'),
-#     'API_SECRET': env('CLOUDINARY_API_SECRET'),
-# }
-
-# DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# Cloudinary media storage is optional. Its packages (requirements-cloudinary.txt)
+# are only installed and imported when CLOUDINARY_CLOUD_NAME is set.
+if env('CLOUDINARY_CLOUD_NAME', default=''):
+    INSTALLED_APPS += ['cloudinary', 'cloudinary_storage']
+    CLOUDINARY_STORAGE = {
+        'CLOUD_NAME': env('CLOUDINARY_CLOUD_NAME'),
+        'API_KEY': env('CLOUDINARY_API_KEY'),
+        'API_SECRET': env('CLOUDINARY_API_SECRET'),
+    }
+    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -75,6 +65,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'cook_platform.wsgi.application'
+ASGI_APPLICATION = 'cook_platform.asgi.application'
 
 DATABASES = {
     'default': {
@@ -87,6 +78,30 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Rate limits are declared per route in core/urls.py; set CACHE_URL to a shared
+# cache (e.g. redis://) so limits hold across workers.
+RATELIMIT_ENABLE = env.bool('RATELIMIT_ENABLE', default=True)
+RATELIMIT_CACHE = 'default'
+RATELIMIT_USE_X_FORWARDED_FOR = env.bool('RATELIMIT_USE_X_FORWARDED_FOR', default=False)
+
+# Upper bound on the cost of a cook_list search (see core.views.search_cost).
+SEARCH_MAX_COST = env.int('SEARCH_MAX_COST', default=6)
+SEARCH_MAX_TERM_LENGTH = 64
+
+# Booking notifications for /events/bookings/: 'postgres' fans out through
+# LISTEN/NOTIFY so every worker sees every change; 'local' stays in-process.
+BOOKING_EVENTS_BACKEND = env('BOOKING_EVENTS_BACKEND', default='postgres')
+BOOKING_EVENTS_QUEUE_SIZE = 20
+
+REVIEWS_PER_PAGE = 10
+
+# Cold-start budget enforced by `manage.py profile_startup --check`.
+STARTUP_BUDGET_MS = env.int('STARTUP_BUDGET_MS', default=1500)
+
 AUTH_USER_MODEL = 'core.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -105,8 +120,8 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
-LANGUAGE_CODE = os.getenv('LANGUAGE_CODE', 'en-us')
-TIME_ZONE = os.getenv('TIME_ZONE', 'UTC')
+LANGUAGE_CODE = env('LANGUAGE_CODE', default='en-us')
+TIME_ZONE = env('TIME_ZONE', default='UTC')
 USE_I18N = True
 USE_TZ = True
 
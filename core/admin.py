@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from .models import User, CookProfile, Booking, Review
+from .admin_performance import PerformanceModelAdmin
+from .models import User, CookProfile, Booking, Review, DemandForecast
 
 
 @admin.register(User)
@@ -14,19 +15,58 @@ class UserAdmin(DjangoUserAdmin):
 @admin.register(CookProfile)
 class CookProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "cuisine", "experience_years", "hourly_rate", "average_rating")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
     search_fields = ("user__username", "cuisine", "dishes", "location")
 
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(PerformanceModelAdmin):
     list_display = ("customer", "cook", "date", "time", "status", "payment_status")
-    list_filter = ("status", "payment_status", "date")
+    list_filter = ("status", "payment_status")
+    list_select_related = ("customer", "cook")
+    autocomplete_fields = ("customer", "cook")
+    date_hierarchy = "date"
+    # Matched exactly (case-sensitive) through the unique username index and
+    # the foreign key indexes; see PerformanceModelAdmin.get_search_results.
     search_fields = ("customer__username", "cook__username")
+    exact_search_fields = ("customer", "cook")
+    search_help_text = "Exact customer or cook username (case-sensitive)."
+    actions = ("mark_confirmed", "mark_completed", "mark_cancelled")
+
+    @admin.action(description="Confirm selected requested bookings")
+    def mark_confirmed(self, request, queryset):
+        updated = queryset.filter(status=Booking.STATUS_REQUESTED).set_status(Booking.STATUS_CONFIRMED)
+        self.message_user(request, f"{updated} booking(s) confirmed.")
+
+    @admin.action(description="Complete selected confirmed bookings")
+    def mark_completed(self, request, queryset):
+        updated = queryset.filter(status=Booking.STATUS_CONFIRMED).set_status(Booking.STATUS_COMPLETED)
+        self.message_user(request, f"{updated} booking(s) completed.")
+
+    @admin.action(description="Cancel and refund selected bookings")
+    def mark_cancelled(self, request, queryset):
+        updated = queryset.filter(
+            status__in=[Booking.STATUS_REQUESTED, Booking.STATUS_CONFIRMED],
+        ).set_status(Booking.STATUS_CANCELLED)
+        self.message_user(request, f"{updated} booking(s) cancelled and refunded.")
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
-    list_display = ("customer", "cook", "rating", "created_at")
-    list_filter = ("rating", "created_at")
-    search_fields = ("customer__username", "cook__username", "comment")
+class ReviewAdmin(PerformanceModelAdmin):
+    list_display = ("customer", "cook", "rating", "moderation_status", "sentiment", "helpfulness", "created_at")
+    list_filter = ("moderation_status", "rating")
+    readonly_fields = ("sentiment", "helpfulness", "keywords", "processed_at")
+    list_select_related = ("customer", "cook")
+    autocomplete_fields = ("customer", "cook")
+    date_hierarchy = "created_at"
+    search_fields = ("customer__username", "cook__username")
+    exact_search_fields = ("customer", "cook")
+    search_help_text = "Exact customer or cook username (case-sensitive)."
+
 
+@admin.register(DemandForecast)
+class DemandForecastAdmin(admin.ModelAdmin):
+    list_display = ("cuisine", "location", "hour_of_week", "expected_bookings", "multiplier", "updated_at")
+    list_filter = ("cuisine",)
+    search_fields = ("cuisine", "location")
@@ -0,0 +1,222 @@
+"""Streaming CSV/JSONL import and export for the core tables.
+
+Used by the ``import_data`` and ``export_data`` management commands. Rows are
+read and written one at a time and written to the database in fixed-size
+batches, so memory stays flat regardless of file or table size. Related users
+are referenced by ``username`` rather than by primary key so that files can
+move between databases.
+"""
+import csv
+import json
+import sys
+import time
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db.models import Avg, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import User, CookProfile, Booking, Review
+
+
+class TableSpec:
+    """How one model maps to flat rows.
+
+    ``fields`` are plain model fields, ``user_fields`` are foreign keys to
+    ``User`` written as usernames, and ``unique_fields`` identify a row when
+    resolving conflicts. ``export_only`` columns are written but ignored on
+    import (``created_at`` is always set by the database on insert).
+    """
+
+    def __init__(self, model, fields, unique_fields, user_fields=(), export_only=()):
+        self.model = model
+        self.fields = list(fields)
+        self.user_fields = list(user_fields)
+        self.unique_fields = list(unique_fields)
+        self.export_only = list(export_only)
+
+    @property
+    def columns(self) -> list:
+        return self.user_fields + self.fields + self.export_only
+
+    def export_rows(self, chunk_size: int):
+        lookups = [f'{name}__username' for name in self.user_fields] + self.fields + self.export_only
+        # iterator() streams through a server-side cursor on PostgreSQL.
+        return self.model.objects.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size)
+
+    def build_objects(self, rows: list) -> tuple[list, int]:
+        """Turn raw rows into unsaved instances; return them and the number skipped.
+
+        Rows repeating a unique key earlier in the batch replace it (and count
+        as skipped): one ``INSERT ... ON CONFLICT DO UPDATE`` cannot touch the
+        same row twice.
+        """
+        user_ids = {}
+        if self.user_fields:
+            names = {row.get(name) for row in rows for name in self.user_fields}
+            user_ids = dict(User.objects.filter(username__in=names).values_list('username', 'id'))
+        key_attnames = [self.model._meta.get_field(name).attname for name in self.unique_fields]
+        objects, skipped = {}, 0
+        for row in rows:
+            try:
+                values = {name: self._to_python(name, row.get(name)) for name in self.fields if name in row}
+                for name in self.user_fields:
+                    values[f'{name}_id'] = user_ids[row.get(name)]
+            except (KeyError, ValidationError):
+                skipped += 1
+                continue
+            obj = self.prepare(self.model(**values), row)
+            key = tuple(getattr(obj, attname) for attname in key_attnames)
+            if key in objects:
+                skipped += 1
+            objects[key] = obj
+        return list(objects.values()), skipped
+
+    def prepare(self, obj, row):
+        return obj
+
+    def after_import(self) -> None:
+        pass
+
+    def _to_python(self, name, value):
+        field = self.model._meta.get_field(name)
+        if value == '' and field.null:
+            return None
+        if value == '' and field.has_default():
+            return field.get_default()
+        # clean() applies choices, max_length, NOT NULL and validators such as
+        # rating's 1-5 range; the database would reject some of these mid-import
+        # (after earlier batches committed) and silently accept the rest.
+        return field.clean(value, None)
+
+    def update_fields(self, columns: set) -> list:
+        """Fields to overwrite on conflict: only those the input actually provides."""
+        return [f for f in self.fields if f in columns and f not in self.unique_fields]
+
+    def save(self, objects: list, on_conflict: str, columns: set) -> None:
+        update_fields = self.update_fields(columns) if on_conflict == 'update' else []
+        if update_fields:
+            self.model.objects.bulk_create(
+                objects, update_conflicts=True,
+                unique_fields=self.unique_fields, update_fields=update_fields,
+            )
+        else:
+            self.model.objects.bulk_create(objects, ignore_conflicts=True)
+
+
+class UserTableSpec(TableSpec):
+    def _to_python(self, name, value):
+        if name == 'password' and not value:
+            return ''  # prepare() stores an unusable password instead.
+        return super()._to_python(name, value)
+
+    def prepare(self, obj, row):
+        # Exports carry password hashes; partner files may leave it blank or
+        # give a plain password, which must be hashed before it is stored.
+        password = row.get('password')
+        if not password:
+            obj.password = make_password(None)
+        else:
+            try:
+                identify_hasher(password)
+            except ValueError:
+                obj.password = make_password(password)
+        return obj
+
+    def update_fields(self, columns: set) -> list:
+        # Never reset credentials or join dates of existing accounts.
+        return [f for f in super().update_fields(columns) if f not in ('password', 'date_joined')]
+
+
+class ReviewTableSpec(TableSpec):
+    def after_import(self) -> None:
+        # bulk_create skips add_review, so refresh every cook's rating in one UPDATE.
+        avg = (
+            Review.objects.filter(cook=OuterRef('user'), moderation_status__in=Review.VISIBLE_STATUSES)
+            .order_by().values('cook').annotate(avg=Avg('rating')).values('avg')
+        )
+        CookProfile.objects.update(average_rating=Coalesce(Subquery(avg, output_field=FloatField()), Value(0.0)))
+
+
+TABLES = {
+    'users': UserTableSpec(
+        User,
+        fields=['username', 'email', 'first_name', 'last_name', 'role', 'password', 'is_active', 'date_joined'],
+        unique_fields=['username'],
+    ),
+    'cooks': TableSpec(
+        CookProfile,
+        fields=['cuisine', 'dishes', 'experience_years', 'hourly_rate', 'location', 'bio', 'average_rating'],
+        user_fields=['user'],
+        unique_fields=['user'],
+    ),
+    'bookings': TableSpec(
+        Booking,
+        fields=['date', 'time', 'duration_hours', 'status', 'payment_status'],
+        user_fields=['customer', 'cook'],
+        unique_fields=['cook', 'date', 'time'],
+        export_only=['created_at'],
+    ),
+    'reviews': ReviewTableSpec(
+        Review,
+        fields=['rating', 'comment'],
+        user_fields=['customer', 'cook'],
+        unique_fields=['customer', 'cook'],
+        export_only=['created_at'],
+    ),
+}
+
+
+def detect_format(path: str, fmt: str = '') -> str:
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def open_stream(path: str, mode: str):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+def read_rows(stream, fmt: str):
+    if fmt == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        yield from csv.DictReader(stream)
+
+
+def write_rows(stream, fmt: str, columns: list, rows):
+    """Write ``rows`` (tuples in ``columns`` order) and yield a running count."""
+    count = 0
+    if fmt == 'jsonl':
+        for row in rows:
+            stream.write(json.dumps(dict(zip(columns, row)), default=str) + '\n')
+            count += 1
+            yield count
+    else:
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            yield count
+
+
+class Throughput:
+    """Report rows and rows/s every ``every`` rows."""
+
+    def __init__(self, write, every: int = 100000):
+        self.write = write
+        self.every = every
+        self.started = time.monotonic()
+        self._next = every
+
+    def update(self, count: int, force: bool = False) -> None:
+        if count >= self._next or force:
+            elapsed = time.monotonic() - self.started
+            rate = count / elapsed if elapsed else float(count)
+            self.write(f'{count} rows in {elapsed:.1f}s ({rate:.0f} rows/s)')
+            self._next = count + self.every
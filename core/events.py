@@ -0,0 +1,186 @@
+"""Booking change notifications for the server-sent events endpoint.
+
+Views publish with :func:`publish_booking` after their transaction commits.
+Each process keeps a :class:`LocalBroker` that fans events out to the open
+``booking_events`` streams of the booking's customer and cook. With the
+``postgres`` backend, events are sent through ``NOTIFY`` instead and one
+``LISTEN`` thread per process feeds them into the local broker, so every
+worker sees every event.
+
+Each subscriber gets a bounded queue. A slow client never blocks publishers:
+when its queue is full the oldest event is dropped and the stream is told to
+resync (reload) instead.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'booking_events'
+# Changes per NOTIFY payload; ~50 bytes each keeps it under PostgreSQL's 8000-byte limit.
+NOTIFY_BATCH = 100
+
+
+class Subscription:
+    def __init__(self, user_id: int, loop, maxsize: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+    def offer(self, event: dict) -> None:
+        # Runs on the subscriber's event loop.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.lagged = True
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        event = await self.queue.get()
+        if self.lagged:
+            self.lagged = False
+            return {'type': 'resync'}
+        return event
+
+
+class LocalBroker:
+    """In-process fan-out from publishers on any thread to async subscribers."""
+
+    def __init__(self, maxsize: int = 20):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.maxsize)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def deliver(self, message: dict) -> None:
+        """Fan a batch of changes out as one event per affected subscriber."""
+        per_user = {}
+        for booking_id, customer_id, cook_id, status, payment_status in message['changes']:
+            change = {'booking': booking_id, 'status': status, 'payment_status': payment_status}
+            for user_id in {customer_id, cook_id}:
+                per_user.setdefault(user_id, []).append(change)
+        with self._lock:
+            targets = [
+                (s, changes) for user_id, changes in per_user.items()
+                for s in self._subscribers.get(user_id, ())
+            ]
+        for subscription, changes in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.offer, {'type': 'booking', 'bookings': changes},
+                )
+            except RuntimeError:
+                # The subscriber's loop has closed; it will unsubscribe itself.
+                pass
+
+
+broker = LocalBroker(maxsize=getattr(settings, 'BOOKING_EVENTS_QUEUE_SIZE', 20))
+
+
+def _backend() -> str:
+    return getattr(settings, 'BOOKING_EVENTS_BACKEND', 'local')
+
+
+def _send(changes: list) -> None:
+    if _backend() != 'postgres':
+        broker.deliver({'changes': changes})
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(changes), NOTIFY_BATCH):
+            payload = json.dumps({'changes': changes[start:start + NOTIFY_BATCH]})
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+
+def publish_bookings(changes: list) -> None:
+    """Notify customers and cooks of booking changes once the transaction commits.
+
+    ``changes`` are ``(booking, customer, cook, status, payment_status)``
+    tuples; they go out as one message per ``NOTIFY_BATCH`` rather than per row.
+    """
+    changes = [list(change) for change in changes]
+    if changes:
+        transaction.on_commit(lambda: _send(changes))
+
+
+def publish_booking(booking_id: int, customer_id: int, cook_id: int, status: str, payment_status: str) -> None:
+    publish_bookings([(booking_id, customer_id, cook_id, status, payment_status)])
+
+
+_listener_lock = threading.Lock()
+_listener_started = False
+
+
+def _listen_forever() -> None:
+    import psycopg2
+    import psycopg2.extensions
+
+    db = settings.DATABASES['default']
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(
+                dbname=db['NAME'], user=db['USER'], password=db['PASSWORD'],
+                host=db['HOST'], port=db['PORT'],
+            )
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            while True:
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    broker.deliver(json.loads(conn.notifies.pop(0).payload))
+        except Exception:
+            logger.exception('Booking events listener failed; reconnecting.')
+            if conn is not None:
+                conn.close()
+            time.sleep(5)
+
+
+def ensure_listener() -> None:
+    """Start this process's LISTEN thread once, when the postgres backend is used."""
+    global _listener_started
+    if _backend() != 'postgres' or _listener_started:
+        return
+    with _listener_lock:
+        if not _listener_started:
+            threading.Thread(target=_listen_forever, name='booking-events', daemon=True).start()
+            _listener_started = True
+
+
+async def stream(user_id: int, keepalive: float = 15.0):
+    """Yield server-sent event frames for ``user_id`` until the client disconnects."""
+    ensure_listener()
+    subscription = broker.subscribe(user_id)
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
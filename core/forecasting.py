@@ -0,0 +1,68 @@
+"""Demand forecasting helpers used by the ``forecast_demand`` command.
+
+Demand is kept in a dense ``(segments, weeks, 168)`` float32 matrix where a
+segment is one normalized ``(cuisine, location)`` pair and the last axis is the
+hour of the week. Memory is therefore ``segments * weeks * 168 * 4`` bytes no
+matter how many bookings are streamed through it.
+"""
+from datetime import date as date_class
+
+import numpy as np
+
+HOURS_PER_WEEK = 168
+
+MIN_MULTIPLIER = 0.8
+MAX_MULTIPLIER = 1.5
+
+
+def empty_demand_matrix(segments: int, weeks: int) -> np.ndarray:
+    return np.zeros((segments, weeks, HOURS_PER_WEEK), dtype=np.float32)
+
+
+def accumulate_chunk(matrix: np.ndarray, start: date_class, segment_ids, days, hours) -> None:
+    """Add one chunk of bookings to ``matrix`` in place.
+
+    ``segment_ids``, ``days`` and ``hours`` are parallel sequences; ``days``
+    holds ``date`` objects and ``hours`` the booking start hour.
+    """
+    if not len(segment_ids):
+        return
+    segments, weeks, _ = matrix.shape
+    seg = np.asarray(segment_ids, dtype=np.int64)
+    ordinals = np.fromiter((d.toordinal() for d in days), dtype=np.int64, count=len(days))
+    offsets = ordinals - start.toordinal()
+    week = offsets // 7
+    # date.weekday() is 0 for Monday; so is (ordinal - 1) % 7.
+    hour_of_week = ((ordinals - 1) % 7) * 24 + np.asarray(hours, dtype=np.int64)
+    keep = (week >= 0) & (week < weeks) & (seg >= 0) & (seg < segments)
+    flat = (seg[keep] * weeks + week[keep]) * HOURS_PER_WEEK + hour_of_week[keep]
+    cells, counts = np.unique(flat, return_counts=True)
+    matrix.reshape(-1)[cells] += counts
+
+
+def forecast(matrix: np.ndarray, alpha: float = 0.3) -> np.ndarray:
+    """Exponentially weighted demand per segment and hour of week.
+
+    Recent weeks weigh more: week ``w`` of ``n`` gets ``(1 - alpha) ** (n - 1 - w)``.
+    Returns a ``(segments, 168)`` array of expected bookings.
+    """
+    weeks = matrix.shape[1]
+    weights = (1.0 - alpha) ** np.arange(weeks - 1, -1, -1, dtype=np.float32)
+    weights /= weights.sum()
+    return np.tensordot(matrix, weights, axes=([1], [0])).astype(np.float32)
+
+
+def suggest_multipliers(expected: np.ndarray, sensitivity: float = 0.5,
+                        floor: float = MIN_MULTIPLIER, ceiling: float = MAX_MULTIPLIER) -> np.ndarray:
+    """Turn expected demand into surge (> 1) or discount (< 1) multipliers.
+
+    Each hour is compared with its segment's average over hours that saw any
+    demand; hours with no history stay at 1.0.
+    """
+    active = expected > 0
+    active_hours = active.sum(axis=1, keepdims=True)
+    mean = np.divide(expected.sum(axis=1, keepdims=True), active_hours,
+                     out=np.zeros((expected.shape[0], 1), dtype=expected.dtype), where=active_hours > 0)
+    ratio = np.divide(expected, mean, out=np.ones_like(expected), where=active)
+    multipliers = np.clip(1.0 + sensitivity * (ratio - 1.0), floor, ceiling)
+    return np.round(multipliers, 2)
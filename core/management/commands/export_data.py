@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.bulkio import TABLES, Throughput, detect_format, open_stream, write_rows
+
+
+class Command(BaseCommand):
+    help = 'Stream-export users, cooks, bookings or reviews to CSV or JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(TABLES))
+        parser.add_argument('path', help='Output file, or "-" for stdout.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='', help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows fetched per cursor round trip.')
+
+    def handle(self, *args, **options):
+        spec = TABLES[options['table']]
+        path = options['path']
+        fmt = detect_format(path, options['format'])
+        progress = Throughput(self.stderr.write)
+        count = 0
+
+        stream = open_stream(path, 'w')
+        try:
+            for count in write_rows(stream, fmt, spec.columns, spec.export_rows(options['chunk_size'])):
+                progress.update(count)
+        finally:
+            if path != '-':
+                stream.close()
+
+        progress.update(count, force=True)
+        if path != '-':
+            self.stdout.write(self.style.SUCCESS(f'Exported {count} {options["table"]} rows to {path}.'))
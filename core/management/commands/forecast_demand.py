@@ -0,0 +1,100 @@
+import time
+from datetime import date as date_class, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.forecasting import (
+    HOURS_PER_WEEK, accumulate_chunk, empty_demand_matrix, forecast, suggest_multipliers,
+)
+from core.models import Booking, CookProfile, DemandForecast
+
+
+class Command(BaseCommand):
+    help = 'Forecast booking demand per cuisine, location and hour of week and store suggested price multipliers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=12, help='Weeks of booking history to use.')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Bookings loaded per database round trip.')
+        parser.add_argument('--alpha', type=float, default=0.3, help='Smoothing factor; higher favours recent weeks.')
+        parser.add_argument('--sensitivity', type=float, default=0.5, help='How strongly demand moves the multiplier.')
+        parser.add_argument('--max-memory-mb', type=int, default=256, help='Upper bound for the demand matrix.')
+
+    def handle(self, *args, **options):
+        weeks = options['weeks']
+        chunk_size = options['chunk_size']
+        if weeks < 1 or chunk_size < 1:
+            raise CommandError('--weeks and --chunk-size must be positive.')
+
+        segment_ids = {}
+        raw_to_segment = {}
+        for cuisine, location in CookProfile.objects.values_list('cuisine', 'location').distinct().iterator():
+            key = (DemandForecast.normalize(cuisine), DemandForecast.normalize(location))
+            raw_to_segment[(cuisine, location)] = segment_ids.setdefault(key, len(segment_ids))
+        if not segment_ids:
+            self.stdout.write('No cook profiles found; nothing to forecast.')
+            return
+
+        matrix_bytes = len(segment_ids) * weeks * HOURS_PER_WEEK * 4
+        if matrix_bytes > options['max_memory_mb'] * 1024 * 1024:
+            raise CommandError(
+                f'Demand matrix needs {matrix_bytes // (1024 * 1024)} MB; '
+                f'lower --weeks or raise --max-memory-mb.'
+            )
+
+        # Align the window to a Monday so week buckets line up with hour_of_week.
+        end = date_class.today() - timedelta(days=date_class.today().weekday())
+        start = end - timedelta(weeks=weeks)
+        matrix = empty_demand_matrix(len(segment_ids), weeks)
+
+        rows = (
+            Booking.objects
+            .filter(date__gte=start, date__lt=end)
+            .exclude(status=Booking.STATUS_CANCELLED)
+            .values_list('cook__cook_profile__cuisine', 'cook__cook_profile__location', 'date', 'time')
+            .order_by()
+            .iterator(chunk_size=chunk_size)
+        )
+        started = time.monotonic()
+        total = 0
+        seg_chunk, day_chunk, hour_chunk = [], [], []
+        for cuisine, location, day, at in rows:
+            segment = raw_to_segment.get((cuisine, location))
+            if segment is None:
+                continue
+            seg_chunk.append(segment)
+            day_chunk.append(day)
+            hour_chunk.append(at.hour)
+            if len(seg_chunk) >= chunk_size:
+                accumulate_chunk(matrix, start, seg_chunk, day_chunk, hour_chunk)
+                total += len(seg_chunk)
+                seg_chunk, day_chunk, hour_chunk = [], [], []
+        accumulate_chunk(matrix, start, seg_chunk, day_chunk, hour_chunk)
+        total += len(seg_chunk)
+        elapsed = time.monotonic() - started
+
+        expected = forecast(matrix, alpha=options['alpha'])
+        multipliers = suggest_multipliers(expected, sensitivity=options['sensitivity'])
+
+        # Only non-neutral slots are stored; DemandForecast.multiplier_for defaults to 1.0.
+        segments_by_id = {index: key for key, index in segment_ids.items()}
+        seg_idx, hour_idx = (multipliers != 1.0).nonzero()
+        forecasts = [
+            DemandForecast(
+                cuisine=segments_by_id[s][0],
+                location=segments_by_id[s][1],
+                hour_of_week=int(h),
+                expected_bookings=round(float(expected[s, h]), 3),
+                multiplier=round(float(multipliers[s, h]), 2),
+            )
+            for s, h in zip(seg_idx.tolist(), hour_idx.tolist())
+        ]
+        with transaction.atomic():
+            DemandForecast.objects.all().delete()
+            DemandForecast.objects.bulk_create(forecasts, batch_size=1000)
+
+        rate = total / elapsed if elapsed else float(total)
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {total} bookings across {len(segment_ids)} segments '
+            f'in {elapsed:.2f}s ({rate:.0f} rows/s); stored {len(forecasts)} forecast slots.'
+        ))
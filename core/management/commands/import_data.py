@@ -0,0 +1,56 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.bulkio import TABLES, Throughput, detect_format, open_stream, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Stream-import users, cooks, bookings or reviews from CSV or JSONL in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(TABLES))
+        parser.add_argument('path', help='Input file, or "-" for stdin.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='', help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--on-conflict', choices=['skip', 'update'], default='skip',
+                            help='What to do with rows that already exist.')
+
+    def handle(self, *args, **options):
+        spec = TABLES[options['table']]
+        path = options['path']
+        fmt = detect_format(path, options['format'])
+        batch_size = options['batch_size']
+        progress = Throughput(self.stderr.write)
+        processed = skipped = 0
+
+        stream = open_stream(path, 'r')
+        try:
+            rows = read_rows(stream, fmt)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                objects, bad = spec.build_objects(batch)
+                # Columns present in every row; anything else keeps its stored value.
+                columns = set.intersection(*(set(row) for row in batch))
+                with transaction.atomic():
+                    spec.save(objects, options['on_conflict'], columns)
+                processed += len(objects)
+                skipped += bad
+                progress.update(processed + skipped)
+        finally:
+            if path != '-':
+                stream.close()
+
+        spec.after_import()
+        progress.update(processed + skipped, force=True)
+        # bulk_create does not report which rows hit a conflict, so valid rows
+        # are counted as processed rather than inserted.
+        existing = 'updated' if options['on_conflict'] == 'update' else 'left unchanged'
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} {options["table"]} rows (existing rows {existing}); '
+            f'skipped {skipped} invalid, unresolved or repeated rows.'
+        ))
+
@@ -0,0 +1,117 @@
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Avg, Q
+from django.utils import timezone
+
+from core.models import CookProfile, Review, ReviewBucket
+from core.moderation import DUPLICATE_SIMILARITY, analyze, similarity
+
+
+class Command(BaseCommand):
+    help = 'Moderate and score new reviews (spam, near duplicates, sentiment) and refresh cook highlights.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=1, help='Processes used for text analysis.')
+        parser.add_argument('--limit', type=int, default=0, help='Stop after this many reviews (0 = all pending).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive.')
+
+        pool = ProcessPoolExecutor(max_workers=options['workers']) if options['workers'] > 1 else None
+        started = time.monotonic()
+        processed = 0
+        touched_cooks = set()
+        counts = Counter()
+        try:
+            while not options['limit'] or processed < options['limit']:
+                size = min(batch_size, options['limit'] - processed) if options['limit'] else batch_size
+                # Served by the partial index on unprocessed reviews.
+                rows = list(
+                    Review.objects.filter(processed_at__isnull=True).order_by('id')
+                    .values_list('id', 'comment', 'cook_id')[:size]
+                )
+                if not rows:
+                    break
+                items = [(review_id, comment) for review_id, comment, _ in rows]
+                if pool is not None:
+                    results = list(pool.map(analyze, items, chunksize=max(1, len(items) // (options['workers'] * 4))))
+                else:
+                    results = [analyze(item) for item in items]
+                with transaction.atomic():
+                    for result in results:
+                        counts[self._store(result)] += 1
+                processed += len(rows)
+                touched_cooks.update(cook_id for _, _, cook_id in rows)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        for cook_id in touched_cooks:
+            self._summarize(cook_id)
+
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed else float(processed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} reviews in {elapsed:.2f}s ({rate:.0f}/s): '
+            f'{counts[Review.MODERATION_APPROVED]} approved, {counts[Review.MODERATION_SPAM]} spam, '
+            f'{counts[Review.MODERATION_DUPLICATE]} duplicate; refreshed {len(touched_cooks)} cook summaries.'
+        ))
+
+    def _store(self, result: dict) -> str:
+        status = Review.MODERATION_APPROVED
+        if result['spam']:
+            status = Review.MODERATION_SPAM
+        elif result['signature'] is not None and self._is_duplicate(result):
+            status = Review.MODERATION_DUPLICATE
+
+        Review.objects.filter(pk=result['id']).update(
+            moderation_status=status,
+            sentiment=result['sentiment'],
+            helpfulness=result['helpfulness'],
+            keywords=result['keywords'],
+            minhash=result['signature'],
+            processed_at=timezone.now(),
+        )
+        if result['buckets'] and status == Review.MODERATION_APPROVED:
+            ReviewBucket.objects.bulk_create([
+                ReviewBucket(review_id=result['id'], band=band, bucket=bucket)
+                for band, bucket in enumerate(result['buckets'])
+            ])
+        return status
+
+    def _is_duplicate(self, result: dict) -> bool:
+        # Reviews sharing any LSH band are candidates; confirm with the full signature.
+        match = Q()
+        for band, bucket in enumerate(result['buckets']):
+            match |= Q(band=band, bucket=bucket)
+        candidates = set(
+            ReviewBucket.objects.filter(match).exclude(review_id=result['id'])
+            .values_list('review_id', flat=True)[:200]
+        )
+        if not candidates:
+            return False
+        signatures = Review.objects.filter(pk__in=candidates).values_list('minhash', flat=True)
+        return any(
+            similarity(result['signature'], bytes(other)) >= DUPLICATE_SIMILARITY
+            for other in signatures if other is not None
+        )
+
+    def _summarize(self, cook_id: int) -> None:
+        # Spam and duplicates are hidden, so they must not weigh on the rating either.
+        visible = Review.objects.filter(cook_id=cook_id, moderation_status__in=Review.VISIBLE_STATUSES)
+        analyzed = visible.filter(processed_at__isnull=False)
+        mentions = Counter()
+        for keywords in analyzed.exclude(keywords='').values_list('keywords', flat=True).iterator():
+            mentions.update(keywords.split(','))
+        CookProfile.objects.filter(user_id=cook_id).update(
+            average_rating=visible.aggregate(avg=Avg('rating'))['avg'] or 0,
+            review_sentiment=round(analyzed.aggregate(avg=Avg('sentiment'))['avg'] or 0.0, 4),
+            review_highlights=', '.join(word for word, _ in mentions.most_common(3)),
+        )
@@ -0,0 +1,67 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: the same work a worker does before serving its
+# first request, including the URLconf (and so every view module).
+BOOT_SCRIPT = (
+    'import time; t = time.perf_counter(); '
+    'from cook_platform.asgi import application; '
+    'from django.urls import get_resolver; get_resolver().url_patterns; '
+    'print("boot_ms=%.1f" % ((time.perf_counter() - t) * 1000))'
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start time of the ASGI app and report the slowest module imports.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to time; the median is reported.')
+        parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list.')
+        parser.add_argument('--check', action='store_true',
+                            help='Exit with an error if boot time exceeds STARTUP_BUDGET_MS.')
+        parser.add_argument('--budget-ms', type=float, default=None, help='Override STARTUP_BUDGET_MS.')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1.')
+        boot_times = [self._boot(importtime=False)[0] for _ in range(options['runs'])]
+        _, imports = self._boot(importtime=True)
+
+        self.stdout.write(f"Slowest imports (cumulative ms) over {len(imports)} modules:")
+        for cumulative_us, self_us, name in sorted(imports, reverse=True)[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f}  {self_us / 1000:8.1f} self  {name}")
+
+        boot_ms = statistics.median(boot_times)
+        budget = options['budget_ms'] if options['budget_ms'] is not None else settings.STARTUP_BUDGET_MS
+        self.stdout.write(
+            f"Worker boot: median {boot_ms:.1f} ms over {len(boot_times)} run(s) "
+            f"(min {min(boot_times):.1f}, max {max(boot_times):.1f}); budget {budget:.0f} ms"
+        )
+        if options['check'] and boot_ms > budget:
+            raise CommandError(f'Boot time {boot_ms:.1f} ms exceeds the {budget:.0f} ms budget.')
+
+    def _boot(self, importtime: bool):
+        cmd = [sys.executable]
+        if importtime:
+            cmd += ['-X', 'importtime']
+        cmd += ['-c', BOOT_SCRIPT]
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), env.get('PYTHONPATH')]))
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=settings.BASE_DIR, env=env)
+        if result.returncode != 0:
+            raise CommandError(f'App failed to boot:\n{result.stderr[-2000:]}')
+
+        boot_ms = float(result.stdout.strip().rsplit('boot_ms=', 1)[-1])
+        imports = []
+        for line in result.stderr.splitlines():
+            # "import time:   self [us] | cumulative | imported package"
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+            imports.append((int(cumulative_us), int(self_us), name))
+        return boot_ms, imports
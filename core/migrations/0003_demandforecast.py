@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_avatar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cuisine', models.CharField(max_length=100)),
+                ('location', models.CharField(max_length=120)),
+                ('hour_of_week', models.PositiveSmallIntegerField(help_text='0 = Monday 00:00, 167 = Sunday 23:00')),
+                ('expected_bookings', models.FloatField(default=0.0)),
+                ('multiplier', models.FloatField(default=1.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('cuisine', 'location', 'hour_of_week')},
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_booking_review_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='cookprofile',
+            name='review_highlights',
+            field=models.CharField(blank=True, help_text='Most mentioned praise in reviews', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='cookprofile',
+            name='review_sentiment',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpfulness',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='keywords',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='minhash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='moderation_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('spam', 'Spam'), ('duplicate', 'Duplicate')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='sentiment',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('moderation_status__in', ['pending', 'approved'])), fields=['cook', '-helpfulness', '-created_at'], name='core_review_helpful_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='core_review_unprocessed_idx'),
+        ),
+        migrations.AddField(
+            model_name='reviewbucket',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='core.review'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewbucket',
+            index=models.Index(fields=['band', 'bucket'], name='core_reviewbucket_lookup_idx'),
+        ),
+    ]
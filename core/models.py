@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
+
+from .events import publish_booking, publish_bookings
 
 
 class User(AbstractUser):
@@ -31,11 +33,55 @@ class CookProfile(models.Model):
     bio = models.TextField(blank=True)
     photo = models.ImageField(upload_to='cook_photos/', blank=True, null=True)
     average_rating = models.FloatField(default=0.0, validators=[MinValueValidator(0.0), MaxValueValidator(5.0)])
+    review_sentiment = models.FloatField(default=0.0)
+    review_highlights = models.CharField(max_length=200, blank=True, help_text='Most mentioned praise in reviews')
 
     def __str__(self) -> str:
         return f"{self.user.get_full_name() or self.user.username} ({self.cuisine})"
 
 
+class BookingQuerySet(models.QuerySet):
+    def set_status(self, status: str, batch_size: int = 1000) -> int:
+        """Move every booking in the queryset to ``status`` in primary-key batches.
+
+        Each batch is one short transaction (lock, ``UPDATE ... WHERE id IN
+        (...)``) that keeps the queryset's own filter, so large selections
+        never hold long row locks. Cancelling also refunds, as
+        ``cancel_booking`` does. Returns the number of rows updated.
+        """
+        changes = {'status': status}
+        if status == Booking.STATUS_CANCELLED:
+            changes['payment_status'] = Booking.PAYMENT_REFUNDED
+        pks = self.order_by().values_list('pk', flat=True)
+        batch, updated = [], 0
+        for pk in pks.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                updated += self._update_batch(batch, changes)
+                batch = []
+        if batch:
+            updated += self._update_batch(batch, changes)
+        return updated
+
+    def _update_batch(self, pks: list, changes: dict) -> int:
+        # Re-check the caller's filter under a row lock: a booking that no
+        # longer matches (e.g. cancelled since it was selected) is left alone
+        # and not published, and published values are the ones written.
+        with transaction.atomic():
+            rows = list(
+                self.filter(pk__in=pks).order_by().select_for_update(of=('self',))
+                .values_list('pk', 'customer_id', 'cook_id', 'payment_status')
+            )
+            if not rows:
+                return 0
+            updated = self.filter(pk__in=[row[0] for row in rows]).update(**changes)
+            publish_bookings([
+                (pk, customer_id, cook_id, changes['status'], changes.get('payment_status', payment_status))
+                for pk, customer_id, cook_id, payment_status in rows
+            ])
+        return updated
+
+
 class Booking(models.Model):
     STATUS_REQUESTED = 'requested'
     STATUS_CONFIRMED = 'confirmed'
@@ -66,25 +112,108 @@ class Booking(models.Model):
     payment_status = models.CharField(max_length=20, choices=PAYMENT_CHOICES, default=PAYMENT_PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ('cook', 'date', 'time')
+        indexes = [
+            models.Index(fields=['date'], name='core_booking_date_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"Booking #{self.id} - {self.customer} -> {self.cook} on {self.date} {self.time}"
 
+    def publish_change(self) -> None:
+        publish_booking(self.pk, self.customer_id, self.cook_id, self.status, self.payment_status)
+
 
 class Review(models.Model):
+    MODERATION_PENDING = 'pending'
+    MODERATION_APPROVED = 'approved'
+    MODERATION_SPAM = 'spam'
+    MODERATION_DUPLICATE = 'duplicate'
+    MODERATION_CHOICES = [
+        (MODERATION_PENDING, 'Pending'),
+        (MODERATION_APPROVED, 'Approved'),
+        (MODERATION_SPAM, 'Spam'),
+        (MODERATION_DUPLICATE, 'Duplicate'),
+    ]
+    VISIBLE_STATUSES = (MODERATION_PENDING, MODERATION_APPROVED)
+
     customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_made')
     cook = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_received')
     rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    moderation_status = models.CharField(max_length=20, choices=MODERATION_CHOICES, default=MODERATION_PENDING)
+    sentiment = models.FloatField(null=True, blank=True)
+    helpfulness = models.FloatField(default=0.0)
+    keywords = models.CharField(max_length=200, blank=True)
+    minhash = models.BinaryField(null=True, editable=False)
+    processed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ('customer', 'cook')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='core_review_created_at_idx'),
+            models.Index(fields=['cook', '-helpfulness', '-created_at'], name='core_review_helpful_idx',
+                         condition=models.Q(moderation_status__in=['pending', 'approved'])),
+            models.Index(fields=['id'], condition=models.Q(processed_at__isnull=True),
+                         name='core_review_unprocessed_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.rating} by {self.customer} for {self.cook}"
 
+
+class ReviewBucket(models.Model):
+    """One MinHash LSH band of a review, for indexed near-duplicate lookups."""
+
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='core_reviewbucket_lookup_idx'),
+        ]
+
+
+class DemandForecast(models.Model):
+    """Suggested price multiplier for one cuisine/location/hour-of-week slot.
+
+    Rows are written by the ``forecast_demand`` management command. Slots
+    without a row have neutral demand, so lookups fall back to 1.0.
+    """
+
+    cuisine = models.CharField(max_length=100)
+    location = models.CharField(max_length=120)
+    hour_of_week = models.PositiveSmallIntegerField(help_text='0 = Monday 00:00, 167 = Sunday 23:00')
+    expected_bookings = models.FloatField(default=0.0)
+    multiplier = models.FloatField(default=1.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('cuisine', 'location', 'hour_of_week')
+
+    def __str__(self) -> str:
+        return f"{self.cuisine} @ {self.location} h{self.hour_of_week}: x{self.multiplier:.2f}"
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return (value or '').strip().casefold()
+
+    @staticmethod
+    def hour_of_week_for(day, at) -> int:
+        return day.weekday() * 24 + at.hour
+
+    @classmethod
+    def multiplier_for(cls, cuisine: str, location: str, day, at) -> float:
+        multiplier = cls.objects.filter(
+            cuisine=cls.normalize(cuisine),
+            location=cls.normalize(location),
+            hour_of_week=cls.hour_of_week_for(day, at),
+        ).values_list('multiplier', flat=True).first()
+        return multiplier if multiplier is not None else 1.0
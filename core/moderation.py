@@ -0,0 +1,182 @@
+"""Text analysis for the ``process_reviews`` pipeline.
+
+Everything here is a pure function of the review text so it can run in worker
+processes without touching the database:
+
+* spam heuristics (links, contact details, shouting, spam phrases),
+* MinHash signatures over word shingles, split into LSH bands so near
+  duplicates can be found with an indexed lookup on ``ReviewBucket``,
+* a lexicon-based sentiment score in ``[-1, 1]`` with simple negation,
+* a helpfulness score used to rank reviews on the cook profile.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+NUM_HASHES = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+SHINGLE_SIZE = 3
+# Reviews shorter than this are too generic ("Great food!") to call duplicates.
+MIN_DUPLICATE_WORDS = 6
+DUPLICATE_SIMILARITY = 0.8
+SPAM_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 1 << 31, size=NUM_HASHES).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_HASHES).astype(np.uint64)
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+|[,.;:!?]")
+_LINK_RE = re.compile(r'(https?://|www\.|\b[\w.-]+@[\w-]+\.\w+|\+?\d[\d\s-]{8,}\d)', re.IGNORECASE)
+_REPEAT_RE = re.compile(r'(.)\1{5,}')
+
+SPAM_PHRASES = (
+    'click here', 'free money', 'buy now', 'limited offer', 'whatsapp', 'telegram',
+    'promo code', 'discount code', 'visit my', 'follow me', 'earn money', 'crypto',
+)
+
+POSITIVE_WORDS = {
+    'amazing', 'awesome', 'authentic', 'best', 'clean', 'delicious', 'excellent', 'fantastic',
+    'flavorful', 'fresh', 'friendly', 'generous', 'good', 'great', 'helpful', 'love', 'loved',
+    'lovely', 'nice', 'perfect', 'polite', 'professional', 'punctual', 'recommend', 'superb',
+    'tasty', 'wonderful', 'yummy',
+}
+NEGATIVE_WORDS = {
+    'awful', 'bad', 'bland', 'burnt', 'cold', 'dirty', 'disappointing', 'disappointed', 'late',
+    'mediocre', 'messy', 'overcooked', 'poor', 'raw', 'rude', 'salty', 'terrible', 'undercooked',
+    'unprofessional', 'worst',
+}
+NEGATIONS = {'not', 'no', 'never', "didn't", "wasn't", "isn't", "don't", 'hardly'}
+# Punctuation that ends a negation's scope ("not good, bland" is not praise for bland).
+CLAUSE_BREAKS = set(',.;:!?')
+
+
+def tokenize(text: str, punctuation: bool = False) -> list:
+    """Lower-cased words, plus clause punctuation as separate tokens if asked for."""
+    tokens = _TOKEN_RE.findall((text or '').lower())
+    if punctuation:
+        return tokens
+    return [token for token in tokens if token not in CLAUSE_BREAKS]
+
+
+def spam_score(text: str) -> float:
+    text = text or ''
+    lowered = text.lower()
+    score = 0.0
+    if _LINK_RE.search(text):
+        score += 0.6
+    score += 0.3 * sum(phrase in lowered for phrase in SPAM_PHRASES)
+    letters = [c for c in text if c.isalpha()]
+    if len(letters) > 20 and sum(c.isupper() for c in letters) / len(letters) > 0.6:
+        score += 0.3
+    if _REPEAT_RE.search(text):
+        score += 0.3
+    return min(score, 1.0)
+
+
+def _polarities(tokens: list):
+    """Yield ``(token, +1 | -1)`` for lexicon words.
+
+    A negation flips the first lexicon word within the next two tokens, unless
+    a clause break comes first.
+    """
+    negated_until = -1
+    for i, token in enumerate(tokens):
+        if token in CLAUSE_BREAKS:
+            negated_until = -1
+        elif token in NEGATIONS:
+            negated_until = i + 2
+        else:
+            polarity = 1 if token in POSITIVE_WORDS else -1 if token in NEGATIVE_WORDS else 0
+            if not polarity:
+                continue
+            if i <= negated_until:
+                polarity = -polarity
+                negated_until = -1
+            yield token, polarity
+
+
+def sentiment(tokens: list) -> float:
+    """Balance of positive and negative lexicon hits, in ``[-1, 1]``."""
+    polarities = [polarity for _, polarity in _polarities(tokens)]
+    positive = polarities.count(1)
+    negative = polarities.count(-1)
+    # The +1 damps single-word reviews towards neutral.
+    return round((positive - negative) / (positive + negative + 1), 4)
+
+
+def helpfulness(tokens: list, sentiment_score: float) -> float:
+    """Longer, more varied and more opinionated reviews rank higher."""
+    if not tokens:
+        return 0.0
+    length = min(len(tokens), 80) / 80
+    variety = len(set(tokens)) / len(tokens)
+    return round(0.6 * length + 0.2 * variety + 0.2 * abs(sentiment_score), 4)
+
+
+def keywords(tokens: list, limit: int = 5) -> list:
+    """Praise words actually used positively, in order of first mention."""
+    seen = []
+    for token, polarity in _polarities(tokens):
+        if polarity > 0 and token in POSITIVE_WORDS and token not in seen:
+            seen.append(token)
+    return seen[:limit]
+
+
+def shingles(tokens: list) -> set:
+    if len(tokens) < SHINGLE_SIZE:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set: set) -> np.ndarray:
+    """``NUM_HASHES`` universal-hash minimums over the shingle set."""
+    hashed = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little') >> 3
+         for s in shingle_set),
+        dtype=np.uint64, count=len(shingle_set),
+    )
+    # (a * x + b) mod p on 61-bit inputs can overflow uint64; the wrap-around is
+    # deterministic, which is all MinHash needs.
+    with np.errstate(over='ignore'):
+        values = (np.outer(hashed, _A) + _B) % _MERSENNE_PRIME
+    return values.min(axis=0)
+
+
+def band_buckets(signature: np.ndarray) -> list:
+    """One signed 63-bit bucket id per LSH band, for a ``BigIntegerField``."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True) >> 1)
+    return buckets
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two stored signatures."""
+    return float(np.mean(np.frombuffer(a, dtype=np.uint64) == np.frombuffer(b, dtype=np.uint64)))
+
+
+def analyze(item: tuple) -> dict:
+    """Score one ``(review_id, comment)`` pair; runs in worker processes."""
+    review_id, comment = item
+    clauses = tokenize(comment, punctuation=True)
+    tokens = [token for token in clauses if token not in CLAUSE_BREAKS]
+    score = sentiment(clauses)
+    result = {
+        'id': review_id,
+        'spam': spam_score(comment) >= SPAM_THRESHOLD,
+        'sentiment': score,
+        'helpfulness': helpfulness(tokens, score),
+        'keywords': ','.join(keywords(clauses)),
+        'signature': None,
+        'buckets': [],
+    }
+    if len(tokens) >= MIN_DUPLICATE_WORDS:
+        signature = minhash(shingles(tokens))
+        result['signature'] = signature.tobytes()
+        result['buckets'] = band_buckets(signature)
+    return result
@@ -0,0 +1,182 @@
+"""Per-route rate limiting for views.
+
+Limits are declared where routes are declared, in ``core/urls.py``::
+
+    path('login/', ratelimit('10/m', key='ip')(views.login_view), name='login')
+
+Counters use a sliding-window approximation (the current fixed window plus a
+weighted share of the previous one) stored in the ``RATELIMIT_CACHE`` cache
+alias, so limits are shared between workers when that cache is shared (Redis,
+database). If the cache backend errors, counting falls back to a per-process
+store so that a cache outage never takes the site down with it.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Parse ``'<count>/<period>'`` such as ``'10/m'`` or ``'100/5m'``."""
+    count, _, period = rate.partition('/')
+    multiplier = int(period[:-1] or 1)
+    if period[-1:] not in PERIODS:
+        raise ValueError(f'Invalid rate {rate!r}; expected e.g. "10/m".')
+    return int(count), multiplier * PERIODS[period[-1]]
+
+
+class LocalCounter:
+    """Thread-safe in-process counter store with the few cache calls we need."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return {k: v for k, (v, expires) in ((k, self._data.get(k, (0, 0))) for k in keys) if expires > now}
+
+    def incr_with_expiry(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._data) > 10000:
+                self._data = {k: item for k, item in self._data.items() if item[1] > now}
+            value, expires = self._data.get(key, (0, 0))
+            if expires <= now:
+                value, expires = 0, now + timeout
+            self._data[key] = (value + 1, expires)
+
+
+local_counter = LocalCounter()
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'RATELIMIT_CACHE', 'default')]
+
+
+def _windows(key: str, period: int) -> tuple[str, str, float]:
+    now = time.time()
+    window = int(now // period)
+    return f'rl:{key}:{window}', f'rl:{key}:{window - 1}', now - window * period
+
+
+def _hit(key: str, limit: int, period: int, count: bool = True) -> int:
+    """Count one request against ``key``; return seconds to wait, or 0 if allowed.
+
+    With ``count=False`` the limit is only checked; see :func:`_count`.
+    """
+    current, previous, elapsed = _windows(key, period)
+
+    try:
+        cache = _shared_cache()
+        counts = cache.get_many([current, previous])
+    except Exception:
+        logger.warning('Rate limit cache unavailable; using in-process counters.', exc_info=True)
+        cache = None
+        counts = local_counter.get_many([current, previous])
+
+    estimated = counts.get(previous, 0) * (period - elapsed) / period + counts.get(current, 0)
+    if estimated >= limit:
+        return max(1, math.ceil(period - elapsed))
+    if count:
+        _incr(cache, current, period)
+    return 0
+
+
+def _count(key: str, period: int) -> None:
+    """Count one request against ``key`` without checking the limit."""
+    current, _, _ = _windows(key, period)
+    try:
+        cache = _shared_cache()
+    except Exception:
+        logger.warning('Rate limit cache unavailable; using in-process counters.', exc_info=True)
+        cache = None
+    _incr(cache, current, period)
+
+
+def _incr(cache, current: str, period: int) -> None:
+    if cache is not None:
+        try:
+            cache.add(current, 0, timeout=period * 2)
+            cache.incr(current)
+            return
+        except Exception:
+            logger.warning('Rate limit cache unavailable; using in-process counters.', exc_info=True)
+    local_counter.incr_with_expiry(current, period * 2)
+
+
+def client_ip(request) -> str:
+    if getattr(settings, 'RATELIMIT_USE_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            # The right-most entry is the one added by our own proxy.
+            return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _request_key(request, key: str) -> str:
+    if key == 'user':
+        if request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{client_ip(request)}'
+    if key == 'ip':
+        return f'ip:{client_ip(request)}'
+    if key == 'username':
+        # The account being logged into, so rotating IPs does not reset the count.
+        username = request.POST.get('username', '').strip().lower()
+        if username:
+            return 'username:' + hashlib.sha256(username.encode()).hexdigest()[:32]
+        return f'ip:{client_ip(request)}'
+    raise ValueError(f'Unknown rate limit key {key!r}; use "ip", "user" or "username".')
+
+
+def login_failed(request, response) -> bool:
+    """``count_if`` for login views: the request did not end up logged in."""
+    return not request.user.is_authenticated
+
+
+def ratelimit(rate: str, key: str = 'ip', methods=('POST',), group: str = '', count_if=None):
+    """Limit a view to ``rate`` requests per client.
+
+    ``key`` is ``'ip'``, ``'user'`` (anonymous users fall back to their IP) or
+    ``'username'``, the POSTed login name, for per-account limits.
+    Only requests whose method is in ``methods`` are counted, and if
+    ``count_if(request, response)`` is given, only those for which it is true
+    once the view has run (e.g. :func:`login_failed`, so that the owner's own
+    logins never use up a per-account limit). Stack the decorator to apply
+    several limits, e.g. one per IP and one per user.
+    """
+    limit, period = parse_rate(rate)
+    methods = {m.upper() for m in methods}
+
+    def decorator(view):
+        scope = group or f'{view.__module__}.{view.__name__}'
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in methods or not getattr(settings, 'RATELIMIT_ENABLE', True):
+                return view(request, *args, **kwargs)
+            counter = f'{scope}:{rate}:{_request_key(request, key)}'
+            retry_after = _hit(counter, limit, period, count=count_if is None)
+            if retry_after:
+                response = HttpResponse('Too many requests. Please try again later.',
+                                        status=429, content_type='text/plain')
+                response['Retry-After'] = str(retry_after)
+                return response
+            response = view(request, *args, **kwargs)
+            if count_if is not None and count_if(request, response):
+                _count(counter, period)
+            return response
+        return wrapped
+    return decorator
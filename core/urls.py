@@ -1,20 +1,25 @@
 from django.urls import path
 from . import views
+from .ratelimit import login_failed, ratelimit
 
 urlpatterns = [
     path('', views.home, name='home'),
 
     # Auth
-    path('register/', views.register, name='register'),
-    path('login/', views.login_view, name='login'),
+    path('register/', ratelimit('10/h', key='ip')(views.register), name='register'),
+    # Every attempt counts per IP; per account only failed ones count, so the
+    # owner's own logins never use up that account's limit.
+    path('login/', ratelimit('10/m', key='ip')(
+        ratelimit('20/h', key='username', count_if=login_failed)(views.login_view)
+    ), name='login'),
     path('logout/', views.logout_view, name='logout'),
 
     # Cooks
-    path('cooks/', views.cook_list, name='cook_list'),
+    path('cooks/', ratelimit('60/m', key='user', methods=['GET'])(views.cook_list), name='cook_list'),
     path('cooks/<int:cook_id>/', views.cook_profile, name='cook_profile'),
 
     # Booking
-    path('book/<int:cook_id>/', views.book_cook, name='book_cook'),
+    path('book/<int:cook_id>/', ratelimit('20/h', key='user')(views.book_cook), name='book_cook'),
     path('bookings/<int:booking_id>/confirm/', views.confirm_booking, name='confirm_booking'),
     path('bookings/<int:booking_id>/cancel/', views.cancel_booking, name='cancel_booking'),
     path('bookings/<int:booking_id>/pay/', views.pay_booking, name='pay_booking'),
@@ -23,6 +28,7 @@ urlpatterns = [
     # Dashboards
     path('dashboard/customer/', views.customer_dashboard, name='customer_dashboard'),
     path('dashboard/cook/', views.cook_dashboard, name='cook_dashboard'),
+    path('events/bookings/', views.booking_events, name='booking_events'),
 
     # Reviews
     path('cooks/<int:cook_id>/review/', views.add_review, name='add_review'),
@@ -2,13 +2,16 @@ from datetime import date as date_class
 
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.db.models import Avg, Q, Sum
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 
+from . import events
 from .forms import UserRegisterForm, LoginForm, CookProfileForm, BookingForm, ReviewForm, UserUpdateForm
-from .models import User, CookProfile, Booking, Review
+from .models import User, CookProfile, Booking, Review, DemandForecast
 
 
 def home(request: HttpRequest) -> HttpResponse:
@@ -61,19 +64,35 @@ def logout_view(request: HttpRequest) -> HttpResponse:
     return redirect('home')
 
 
+def search_cost(*terms: tuple) -> int:
+    """Rough cost of the ``icontains`` filters for ``(term, columns)`` pairs.
+
+    The filters are ANDed and evaluated in one scan, so a search costs as much
+    as its most selective term. Very short terms match almost every row, so
+    they cost more than longer ones, once per column they are matched against.
+    """
+    return min((columns * (3 if len(term) < 3 else 1) for term, columns in terms if term), default=0)
+
+
 def cook_list(request: HttpRequest) -> HttpResponse:
     cooks = CookProfile.objects.select_related('user')
-    q = request.GET.get('q', '').strip()
-    cuisine = request.GET.get('cuisine', '').strip()
-    location = request.GET.get('location', '').strip()
+    max_len = settings.SEARCH_MAX_TERM_LENGTH
+    q = request.GET.get('q', '').strip()[:max_len]
+    cuisine = request.GET.get('cuisine', '').strip()[:max_len]
+    location = request.GET.get('location', '').strip()[:max_len]
     min_rate = request.GET.get('min_rate', '').strip()
     max_rate = request.GET.get('max_rate', '').strip()
     min_rating = request.GET.get('min_rating', '').strip()
 
-    if q:
+    # q searches two columns. cuisine is an exact value from the dropdown, so it
+    # is not a free-text term.
+    if search_cost((q, 2), (location, 1)) > settings.SEARCH_MAX_COST:
+        messages.error(request, 'Search is too broad. Please use a longer search term.')
+        cooks = cooks.none()
+    elif q:
         cooks = cooks.filter(Q(user__username__icontains=q) | Q(dishes__icontains=q))
     if cuisine:
-        cooks = cooks.filter(cuisine__icontains=cuisine)
+        cooks = cooks.filter(cuisine=cuisine)
     if location:
         cooks = cooks.filter(location__icontains=location)
     if min_rate:
@@ -101,11 +120,30 @@ def cook_list(request: HttpRequest) -> HttpResponse:
 def cook_profile(request: HttpRequest, cook_id: int) -> HttpResponse:
     cook_user = get_object_or_404(User, id=cook_id, role=User.ROLE_COOK)
     profile = get_object_or_404(CookProfile, user=cook_user)
-    reviews = Review.objects.filter(cook=cook_user).select_related('customer')
+    # Top reviews first; one query per page via the partial helpfulness index,
+    # fetching one extra row to know whether another page exists.
+    per_page = settings.REVIEWS_PER_PAGE
+    try:
+        page = max(1, int(request.GET.get('reviews_page', 1)))
+    except ValueError:
+        page = 1
+    offset = (page - 1) * per_page
+    reviews = list(
+        Review.objects
+        .filter(cook=cook_user, moderation_status__in=Review.VISIBLE_STATUSES)
+        .select_related('customer')
+        .order_by('-helpfulness', '-created_at')[offset:offset + per_page + 1]
+    )
+    has_more_reviews = len(reviews) > per_page
+    now = timezone.localtime()
+    demand_multiplier = DemandForecast.multiplier_for(profile.cuisine, profile.location, now.date(), now.time())
     return render(request, 'core/cook_profile.html', {
         'cook_user': cook_user,
         'profile': profile,
-        'reviews': reviews,
+        'reviews': reviews[:per_page],
+        'reviews_page': page,
+        'has_more_reviews': has_more_reviews,
+        'demand_multiplier': demand_multiplier,
         'booking_form': BookingForm(),
         'review_form': ReviewForm(),
     })
@@ -129,7 +167,15 @@ def book_cook(request: HttpRequest, cook_id: int) -> HttpResponse:
             except Exception:
                 messages.error(request, 'Selected time is no longer available.')
                 return redirect('cook_profile', cook_id=cook_id)
+            booking.publish_change()
             messages.success(request, 'Booking requested!')
+            profile = getattr(cook_user, 'cook_profile', None)
+            if profile is not None:
+                multiplier = DemandForecast.multiplier_for(profile.cuisine, profile.location, booking.date, booking.time)
+                if multiplier > 1:
+                    messages.info(request, f'This is a high-demand slot (suggested rate x{multiplier:.2f}).')
+                elif multiplier < 1:
+                    messages.info(request, f'This is a quiet slot (suggested rate x{multiplier:.2f}).')
             return redirect('customer_dashboard')
         messages.error(request, 'Please correct the errors in booking form.')
     else:
@@ -145,6 +191,7 @@ def confirm_booking(request: HttpRequest, booking_id: int) -> HttpResponse:
         return redirect('home')
     booking.status = Booking.STATUS_CONFIRMED
     booking.save(update_fields=['status'])
+    booking.publish_change()
     messages.success(request, 'Booking confirmed. Waiting for customer payment.')
     return redirect('cook_dashboard')
 
@@ -158,6 +205,7 @@ def cancel_booking(request: HttpRequest, booking_id: int) -> HttpResponse:
     booking.status = Booking.STATUS_CANCELLED
     booking.payment_status = Booking.PAYMENT_REFUNDED
     booking.save(update_fields=['status', 'payment_status'])
+    booking.publish_change()
     messages.info(request, 'Booking cancelled and payment refunded.')
     if request.user.is_cook():
         return redirect('cook_dashboard')
@@ -217,8 +265,10 @@ def add_review(request: HttpRequest, cook_id: int) -> HttpResponse:
             except Exception:
                 messages.error(request, 'You have already reviewed this cook.')
                 return redirect('customer_dashboard')
-            # Update average rating
-            avg = Review.objects.filter(cook=cook_user).aggregate(avg=Avg('rating'))['avg'] or 0
+            # Update average rating (reviews moderated as spam or duplicates don't count)
+            avg = Review.objects.filter(
+                cook=cook_user, moderation_status__in=Review.VISIBLE_STATUSES,
+            ).aggregate(avg=Avg('rating'))['avg'] or 0
             CookProfile.objects.filter(user=cook_user).update(average_rating=avg)
             messages.success(request, 'Review added!')
             return redirect('customer_dashboard')
@@ -237,6 +287,7 @@ def complete_booking(request: HttpRequest, booking_id: int) -> HttpResponse:
         return redirect('cook_dashboard')
     booking.status = Booking.STATUS_COMPLETED
     booking.save(update_fields=['status'])
+    booking.publish_change()
     messages.success(request, 'Booking marked as completed.')
     return redirect('cook_dashboard')
 
@@ -263,6 +314,7 @@ def pay_booking(request: HttpRequest, booking_id: int) -> HttpResponse:
         # Simulate successful payment
         booking.payment_status = Booking.PAYMENT_PAID
         booking.save(update_fields=['payment_status'])
+        booking.publish_change()
         messages.success(request, 'Payment successful!')
         return redirect('customer_dashboard')
 
@@ -302,3 +354,17 @@ def profile(request: HttpRequest) -> HttpResponse:
         'profile_obj': profile_obj,
     })
 
+
+async def booking_events(request: HttpRequest) -> HttpResponse:
+    """Server-sent events stream of booking changes for the signed-in user.
+
+    Needs an ASGI server (see ``cook_platform/asgi.py``) so the open
+    connection does not tie up a worker thread.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    response = StreamingHttpResponse(events.stream(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,18 @@
+"""Gunicorn settings for production (see Procfile)."""
+import os
+
+worker_class = 'uvicorn.workers.UvicornWorker'
+# Worker count is left to gunicorn: WEB_CONCURRENCY if the platform sets it,
+# otherwise gunicorn's default of one.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Import Django, settings and all apps once in the master, then fork. Workers
+# start warm and share the imported code pages copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master before workers fork: load the URLconf and views too,
+    # which Django would otherwise import lazily on each worker's first request.
+    from django.urls import get_resolver
+    get_resolver().url_patterns
@@ -61,3 +61,13 @@ document.addEventListener('click', function(e){
   });
 })();
 
+
+// Live booking updates on dashboards (server-sent events)
+(function(){
+  const el = document.getElementById('bookingEvents');
+  if(!el || !window.EventSource) return;
+  const source = new EventSource(el.getAttribute('data-url'));
+  const refresh = function(){ source.close(); window.location.reload(); };
+  source.addEventListener('booking', refresh);
+  source.addEventListener('resync', refresh);
+})();